@@ -1,22 +1,28 @@
 """KTrajectory dataclass."""
 
+import operator
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import reduce
 from typing import Literal
 
 import ismrmrd
-import numpy as np
 import torch
 from typing_extensions import Self
 
 from mrpro.data.enums import TrajType
-from mrpro.data.MoveDataMixin import MoveDataMixin
+from mrpro.data.MoveDataMixin import InconsistentDeviceError, MoveDataMixin
 from mrpro.data.SpatialDimension import SpatialDimension
 from mrpro.utils.reduce_repeat import reduce_repeat
 from mrpro.utils.reshape import unsqueeze_at
 from mrpro.utils.summarize_tensorvalues import summarize_tensorvalues
 from mrpro.utils.typing import FileOrPath
 
+# number of trajectory values checked at once when detecting if a large trajectory lies on a grid
+_GRID_DETECTION_CHUNK_SIZE = 2**20
+# trajectories with at most this many values are checked for lying on a grid in a single pass
+_GRID_DETECTION_MAX_NUMEL_SINGLE_PASS = 16 * _GRID_DETECTION_CHUNK_SIZE
+
 
 @dataclass(slots=True, frozen=True)
 class KTrajectory(MoveDataMixin):
@@ -56,18 +62,23 @@ class KTrajectory(MoveDataMixin):
         def as_any_float(tensor: torch.Tensor) -> torch.Tensor:
             return tensor.float() if not tensor.is_floating_point() else tensor
 
+        def reduce_and_cast(tensor: torch.Tensor, tolerance: float) -> torch.Tensor:
+            if tensor.numel() > 1:  # a single value is already fully reduced
+                tensor = reduce_repeat(tensor, tolerance)
+            # cast after the reduction to only convert the remaining values
+            return as_any_float(tensor)
+
         if self.repeat_detection_tolerance is not None:
-            kz, ky, kx = (
-                as_any_float(reduce_repeat(tensor, self.repeat_detection_tolerance))
-                for tensor in (self.kz, self.ky, self.kx)
-            )
+            kz = reduce_and_cast(self.kz, self.repeat_detection_tolerance)
+            ky = reduce_and_cast(self.ky, self.repeat_detection_tolerance)
+            kx = reduce_and_cast(self.kx, self.repeat_detection_tolerance)
             # use of setattr due to frozen dataclass
             object.__setattr__(self, 'kz', kz)
             object.__setattr__(self, 'ky', ky)
             object.__setattr__(self, 'kx', kx)
 
         try:
-            shape = self.broadcasted_shape
+            shape = torch.broadcast_shapes(self.kz.shape, self.ky.shape, self.kx.shape)
         except RuntimeError:
             raise ValueError('The k-space trajectory dimensions must be broadcastable.') from None
 
@@ -241,20 +252,30 @@ class KTrajectory(MoveDataMixin):
         """
         # Matrix describing trajectory-type [(kz, ky, kx), (k2, k1, k0)]
         # Start with everything not on a grid (arbitrary k-space locations).
-        # We use the value of the enum-type to make it easier to do array operations.
-        traj_type_matrix = torch.zeros(3, 3, dtype=torch.int)
+        # We use the integer value of the enum-type to combine the flags with bit operations.
+        traj_type_matrix = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
         for ind, ks in enumerate((self.kz, self.ky, self.kx)):
-            values_on_grid = not ks.is_floating_point() or torch.all((ks - ks.round()).abs() <= tolerance)
+            if not ks.is_floating_point():
+                values_on_grid = True
+            elif ks.numel() <= _GRID_DETECTION_MAX_NUMEL_SINGLE_PASS:
+                values_on_grid = bool(torch.isclose(ks, ks.round(), atol=tolerance, rtol=0).all())
+            else:
+                # a single off-grid point decides, so scan large tensors in chunks and stop at the first violation.
+                # each chunk requires a host synchronization, thus this is only done for large tensors.
+                values_on_grid = True
+                for chunk in ks.flatten().split(_GRID_DETECTION_CHUNK_SIZE):
+                    if not torch.isclose(chunk, chunk.round(), atol=tolerance, rtol=0).all():
+                        values_on_grid = False
+                        break
+            on_grid_flag = TrajType.ONGRID.value if values_on_grid else 0
             for dim in (-3, -2, -1):
-                if ks.shape[dim] == 1:
-                    traj_type_matrix[ind, dim] |= TrajType.SINGLEVALUE.value | TrajType.ONGRID.value
-                if values_on_grid:
-                    traj_type_matrix[ind, dim] |= TrajType.ONGRID.value
+                single_value_flag = (TrajType.SINGLEVALUE.value | TrajType.ONGRID.value) if ks.shape[dim] == 1 else 0
+                traj_type_matrix[ind][dim] = on_grid_flag | single_value_flag
 
         # kz should only have flags that are enabled in all columns
         # k2 only flags enabled in all rows, etc
-        type_zyx = [TrajType(int(i)) for i in np.bitwise_and.reduce(traj_type_matrix.numpy(), axis=1)]
-        type_210 = [TrajType(int(i)) for i in np.bitwise_and.reduce(traj_type_matrix.numpy(), axis=0)]
+        type_zyx = [TrajType(reduce(operator.and_, row)) for row in traj_type_matrix]
+        type_210 = [TrajType(reduce(operator.and_, column)) for column in zip(*traj_type_matrix, strict=True)]
 
         # make mypy recognize return  will always have len=3
         return (type_zyx[0], type_zyx[1], type_zyx[2]), (type_210[0], type_210[1], type_210[2])
@@ -267,8 +288,25 @@ class KTrajectory(MoveDataMixin):
         stack_dim
             The dimension to stack the tensor along.
         """
+        if not self.kz.device == self.ky.device == self.kx.device:
+            raise InconsistentDeviceError(self.kz.device, self.ky.device, self.kx.device)
+        if self.kz.shape == self.ky.shape == self.kx.shape:
+            # nothing to broadcast
+            return torch.stack((self.kz, self.ky, self.kx), dim=stack_dim)
         shape = self.broadcasted_shape
-        return torch.stack([traj.expand(*shape) for traj in (self.kz, self.ky, self.kx)], dim=stack_dim)
+        ndim = len(shape) + 1
+        if not -ndim <= stack_dim < ndim:
+            raise IndexError(
+                f'Dimension out of range (expected to be in range of [{-ndim}, {ndim - 1}], got {stack_dim})'
+            )
+        stack_dim = stack_dim % ndim
+        dtype = torch.promote_types(torch.promote_types(self.kz.dtype, self.ky.dtype), self.kx.dtype)
+        # write into a preallocated tensor instead of stacking expanded copies.
+        # it is allocated in the final layout, so the result is contiguous like the one of torch.stack
+        out = torch.empty((*shape[:stack_dim], 3, *shape[stack_dim:]), dtype=dtype, device=self.kx.device)
+        for i, traj in enumerate((self.kz, self.ky, self.kx)):
+            out.select(stack_dim, i).copy_(traj)  # copy_ broadcasts singleton dimensions
+        return out
 
     def __repr__(self):
         """Representation method for KTrajectory class."""
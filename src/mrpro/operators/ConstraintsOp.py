@@ -1,5 +1,6 @@
 """Operator enforcing constraints by variable transformations."""
 
+import math
 from collections.abc import Sequence
 
 import torch
@@ -7,6 +8,12 @@ import torch.nn.functional as F  # noqa: N812
 
 from mrpro.operators.EndomorphOperator import EndomorphOperator, endomorph
 
+# transformation cases, depending on which bounds of an input are finite
+_TWO_SIDED, _LOWER_ONLY, _UPPER_ONLY, _UNCONSTRAINED = range(4)
+
+# maximum total number of elements of inputs that are concatenated to be transformed together
+_MAX_NUMEL_CONCATENATION = 1_000_000
+
 
 class ConstraintsOp(EndomorphOperator):
     """Transformation to map real-valued tensors to certain ranges."""
@@ -54,8 +61,12 @@ class ConstraintsOp(EndomorphOperator):
         self.upper_bounds = [bound[1] for bound in bounds]
 
         for lb, ub in bounds:
+            if (lb is not None and lb == math.inf) or (ub is not None and ub == -math.inf):
+                raise ValueError(
+                    f'a lower bound of inf or an upper bound of -inf is not valid;\nbound tuple {lb, ub} is invalid'
+                )
             if lb is not None and ub is not None:
-                if torch.isnan(torch.tensor(lb)) or torch.isnan(torch.tensor(ub)):
+                if math.isnan(lb) or math.isnan(ub):
                     raise ValueError(f' "nan" is not a valid lower or upper bound;\nbound tuple {lb, ub} is invalid')
 
                 if lb >= ub:
@@ -64,30 +75,77 @@ class ConstraintsOp(EndomorphOperator):
                         f'\nbound tuple {lb, ub} is invalid',
                     )
 
+        # the transformation only depends on the bounds, so it is chosen once here instead of in every call
+        self._cases: list[int] = []
+        for lb, ub in bounds:
+            has_lower = lb is not None and lb != -math.inf
+            has_upper = ub is not None and ub != math.inf
+            if has_lower and has_upper:
+                self._cases.append(_TWO_SIDED)
+            elif has_lower:
+                self._cases.append(_LOWER_ONLY)
+            elif has_upper:
+                self._cases.append(_UPPER_ONLY)
+            else:
+                self._cases.append(_UNCONSTRAINED)
+        # bounds as floats, None is replaced by an infinite bound
+        self._lower_bounds = [-math.inf if lb is None else lb for lb in self.lower_bounds]
+        self._upper_bounds = [math.inf if ub is None else ub for ub in self.upper_bounds]
+        # width of the range, only used for two-sided bounds
+        self._widths = [ub - lb for lb, ub in zip(self._lower_bounds, self._upper_bounds, strict=True)]
+        # indices of inputs with the same bounds, these are transformed together
+        self._groups: dict[tuple[float, float], list[int]] = {}
+        for i, case in enumerate(self._cases):
+            if case != _UNCONSTRAINED:
+                self._groups.setdefault((self._lower_bounds[i], self._upper_bounds[i]), []).append(i)
+
     @staticmethod
     def sigmoid(x: torch.Tensor, beta: float = 1.0) -> torch.Tensor:
         """Constraint x to be in the range given by 'bounds'."""
         return F.sigmoid(beta * x)
 
     @staticmethod
-    def sigmoid_inverse(x: torch.Tensor, beta: float = 1.0) -> torch.Tensor:
-        """Constraint x to be in the range given by 'bounds'."""
-        return torch.logit(x) / beta
+    def sigmoid_inverse(x: torch.Tensor, beta: float = 1.0, lower: float = 0.0, upper: float = 1.0) -> torch.Tensor:
+        """Inverse of `sigmoid` scaled to the range (lower, upper).
+
+        Equivalent to `logit((x - lower) / (upper - lower)) / beta`, but as a single expression.
+        """
+        return torch.log((x - lower) / (upper - x)) / beta
 
     @staticmethod
     def softplus(x: torch.Tensor, beta: float = 1.0) -> torch.Tensor:
         """Constrain x to be in (bound,infty)."""
-        return -(1 / beta) * torch.nn.functional.logsigmoid(-beta * x)
+        # single fused kernel, equivalent to -logsigmoid(-beta * x) / beta
+        return F.softplus(x, beta=beta)
 
     @staticmethod
     def softplus_inverse(x: torch.Tensor, beta: float = 1.0) -> torch.Tensor:
         """Inverse of `softplus_transformation`."""
         return x + torch.log(-torch.expm1(-beta * x)) / beta
 
+    def _transform(self, x: torch.Tensor, index: int) -> torch.Tensor:
+        """Apply the transformation for the bounds at `index`."""
+        case, lb, ub = self._cases[index], self._lower_bounds[index], self._upper_bounds[index]
+        if case == _TWO_SIDED:
+            # case (a,b) with a<b and a,b \in R
+            return lb + self._widths[index] * self.sigmoid(x, beta=self.beta_sigmoid)
+        if case == _LOWER_ONLY:
+            # case (a,None); corresponds to (a, \infty)
+            return lb + self.softplus(x, beta=self.beta_softplus)
+        if case == _UPPER_ONLY:
+            # case (None,b); corresponds to (-\infty, b)
+            return ub - self.softplus(-x, beta=self.beta_softplus)
+        # case (None,None); corresponds to (-\infty, \infty), i.e. no transformation
+        return x
+
     @endomorph
     def forward(self, *x: torch.Tensor) -> tuple[torch.Tensor, ...]:
         """Transform tensors to chosen range.
 
+        Inputs with the same bounds, dtype and device that do not require gradients are transformed together.
+        The corresponding outputs are views of a single shared tensor, which is kept alive as long as any
+        of these outputs is. Inputs that require gradients are always transformed separately.
+
         Parameters
         ----------
         x
@@ -97,28 +155,32 @@ class ConstraintsOp(EndomorphOperator):
         -------
             tensors transformed to the range defined by the chosen bounds
         """
-        x_constrained = []
-        for item, lb, ub in zip(x, self.lower_bounds, self.upper_bounds, strict=False):
-            # distinguish cases
-            if (lb is not None and not torch.isneginf(torch.tensor(lb))) and (
-                ub is not None and not torch.isposinf(torch.tensor(ub))
-            ):
-                # case (a,b) with a<b and a,b \in R
-                x_constrained.append(lb + (ub - lb) * self.sigmoid(item, beta=self.beta_sigmoid))
-
-            elif lb is not None and (ub is None or torch.isposinf(torch.tensor(ub))):
-                # case (a,None); corresponds to (a, \infty)
-                x_constrained.append(lb + self.softplus(item, beta=self.beta_softplus))
+        # inputs without bounds and inputs beyond the number of bounds are passed on without transformation
+        x_constrained = list(x)
+
+        for indices in self._groups.values():
+            # inputs sharing the same bounds, dtype and device are transformed as one concatenated tensor.
+            # this is not done for inputs requiring gradients, as the outputs would be views sharing one autograd
+            # graph, thus could neither be modified in-place nor have independent requires_grad.
+            groups: dict[tuple[torch.dtype, torch.device], list[int]] = {}
+            for i in indices:
+                if i < len(x):
+                    groups.setdefault((x[i].dtype, x[i].device), []).append(i)
+            for group in groups.values():
+                items = [x[i] for i in group]
+                if (
+                    len(items) > 1
+                    and sum(item.numel() for item in items) < _MAX_NUMEL_CONCATENATION
+                    and not any(item.requires_grad for item in items)
+                ):
+                    flat = self._transform(torch.cat([item.flatten() for item in items]), group[0])
+                    sizes = [item.numel() for item in items]
+                    items = [t.reshape(item.shape) for t, item in zip(flat.split(sizes), items, strict=True)]
+                else:
+                    items = [self._transform(item, i) for item, i in zip(items, group, strict=True)]
+                for i, item in zip(group, items, strict=True):
+                    x_constrained[i] = item
 
-            elif (lb is None or torch.isneginf(torch.tensor(lb))) and ub is not None:
-                # case (None,b); corresponds to (-\infty, b)
-                x_constrained.append(ub - self.softplus(-item, beta=self.beta_softplus))
-            elif (lb is None or torch.isneginf(torch.tensor(lb))) and (ub is None or torch.isposinf(torch.tensor(ub))):
-                # case (None,None); corresponds to (-\infty, \infty), i.e. no transformation
-                x_constrained.append(item)
-
-        # if there are more inputs than bounds, pass on the remaining inputs without transformation
-        x_constrained.extend(x[len(x_constrained) :])
         return tuple(x_constrained)
 
     def inverse(self, *x_constrained: torch.Tensor) -> tuple[torch.Tensor, ...]:
@@ -136,22 +198,17 @@ class ConstraintsOp(EndomorphOperator):
         # iterate over the tensors and constrain them if necessary according to the
         # chosen bounds
         x = []
-        for item, lb, ub in zip(x_constrained, self.lower_bounds, self.upper_bounds, strict=False):
-            # distinguish cases
-            if (lb is not None and not torch.isneginf(torch.tensor(lb))) and (
-                ub is not None and not torch.isposinf(torch.tensor(ub))
-            ):
+        for item, case, lb, ub in zip(x_constrained, self._cases, self._lower_bounds, self._upper_bounds, strict=False):
+            if case == _TWO_SIDED:
                 # case (a,b) with a<b and a,b \in R
-                x.append(self.sigmoid_inverse((item - lb) / (ub - lb), beta=self.beta_sigmoid))
-
-            elif lb is not None and (ub is None or torch.isposinf(torch.tensor(ub))):
+                x.append(self.sigmoid_inverse(item, beta=self.beta_sigmoid, lower=lb, upper=ub))
+            elif case == _LOWER_ONLY:
                 # case (a,None); corresponds to (a, \infty)
                 x.append(self.softplus_inverse(item - lb, beta=self.beta_softplus))
-
-            elif (lb is None or torch.isneginf(torch.tensor(lb))) and ub is not None:
+            elif case == _UPPER_ONLY:
                 # case (None,b); corresponds to (-\infty, b)
                 x.append(-self.softplus_inverse(-(item - ub), beta=self.beta_softplus))
-            elif (lb is None or torch.isneginf(torch.tensor(lb))) and (ub is None or torch.isposinf(torch.tensor(ub))):
+            else:
                 # case (None,None); corresponds to (-\infty, \infty), i.e. no transformation
                 x.append(item)
 
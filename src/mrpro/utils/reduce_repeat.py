@@ -29,6 +29,9 @@ def reduce_repeat(tensor: torch.Tensor, tol: float = 1e-6, dim: Sequence[int] |
         if dim is not None and d not in dim:
             # not in the list of dimensions to reduce
             return False
+        if tensor.shape[d] == 1:
+            # already a singleton, no need to compare values
+            return True
         if tensor.stride(d) == 0:
             # broadcasted dimension
             return True
@@ -272,7 +272,7 @@ def test_KData_split_k1_into_other(consistently_shaped_kdata, n_other_split: int
 
     # Split index
     k1_per_block = n_k1 // n_other_split
-    idx_k1 = torch.linspace(0, n_k1 - 1, n_k1, dtype=torch.int32)
+    idx_k1 = torch.arange(n_k1, dtype=torch.int32)
     idx_split = split_idx(idx_k1, k1_per_block)
 
     # Split data
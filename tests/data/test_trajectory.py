@@ -1,5 +1,7 @@
 """Tests for KTrajectory class."""
 
+import importlib
+
 import pytest
 import torch
 from einops import rearrange
@@ -61,6 +63,17 @@ def test_trajectory_tensor_conversion(cartesian_grid) -> None:
     torch.testing.assert_close(tensor, tensor_from_traj_from_tensor_dim3)
 
 
+@pytest.mark.parametrize('stack_dim', [0, 2, -1])
+def test_trajectory_tensor_contiguous(cartesian_grid, stack_dim: int) -> None:
+    """The tensor representation should be contiguous with and without broadcasting."""
+    kz_full, ky_full, kx_full = cartesian_grid(30, 20, 10, jitter=0.1)
+    broadcasted = KTrajectory(kz_full, ky_full, kx_full, repeat_detection_tolerance=None)
+    reduced = KTrajectory(kz_full.round(), ky_full.round(), kx_full.round())
+    assert broadcasted.as_tensor(stack_dim).is_contiguous()
+    assert reduced.as_tensor(stack_dim).is_contiguous()
+    assert reduced.as_tensor(stack_dim).shape == broadcasted.as_tensor(stack_dim).shape
+
+
 def test_trajectory_raise_not_broadcastable() -> None:
     """Non broadcastable shapes should raise."""
     kx = ky = torch.arange(1 * 2 * 3 * 4).reshape(1, 2, 3, 4)
@@ -76,6 +89,21 @@ def test_trajectory_raise_wrong_dim() -> None:
         KTrajectory(kz, ky, kx)
 
 
+@pytest.mark.parametrize('off_grid', [True, False])
+def test_trajectory_grid_detection_chunked(monkeypatch, off_grid: bool) -> None:
+    """Test grid detection for trajectories that are scanned in chunks."""
+    module = importlib.import_module('mrpro.data.KTrajectory')
+    monkeypatch.setattr(module, '_GRID_DETECTION_CHUNK_SIZE', 4)
+    monkeypatch.setattr(module, '_GRID_DETECTION_MAX_NUMEL_SINGLE_PASS', 8)
+    kx = torch.arange(100, dtype=torch.float32).reshape(1, 1, 1, 1, 100)
+    if off_grid:
+        kx[..., -1] += 0.5  # only the last chunk is off-grid
+    kz = ky = torch.zeros(1, 1, 1, 1, 1)
+    trajectory = KTrajectory(kz, ky, kx, repeat_detection_tolerance=None)
+    assert bool(trajectory.type_along_kzyx[2] & TrajType.ONGRID) != off_grid
+    assert bool(trajectory.type_along_k210[2] & TrajType.ONGRID) != off_grid
+
+
 def test_trajectory_to_float64(cartesian_grid) -> None:
     """Change KTrajectory dtype to float64."""
     n_k0 = 10
@@ -92,6 +120,35 @@ def test_trajectory_to_float64(cartesian_grid) -> None:
     assert trajectory.kx.dtype == torch.float32
 
 
+def test_trajectory_type_after_apply(cartesian_grid) -> None:
+    """The trajectory type should reflect in-place changes of kz, ky, kx by apply_."""
+    kz_full, ky_full, kx_full = cartesian_grid(30, 20, 10, jitter=0.1)
+    trajectory = KTrajectory(kz_full, ky_full, kx_full)
+    assert not trajectory.type_along_kzyx[2] & TrajType.ONGRID
+    trajectory.apply_(lambda x: x.round() if isinstance(x, torch.Tensor) else x)
+    assert trajectory.type_along_kzyx[2] & TrajType.ONGRID
+    trajectory.kx.add_(0.5)
+    assert not trajectory.type_along_kzyx[2] & TrajType.ONGRID
+
+
+def test_trajectory_type_inference_mode(cartesian_grid) -> None:
+    """The trajectory type should be available for trajectories created in inference mode."""
+    with torch.inference_mode():
+        kz_full, ky_full, kx_full = cartesian_grid(30, 20, 10, jitter=0.0)
+        trajectory = KTrajectory(kz_full, ky_full, kx_full)
+    assert all(t & TrajType.ONGRID for t in trajectory.type_along_kzyx)
+    assert all(t & TrajType.ONGRID for t in trajectory.type_along_k210)
+
+
+def test_trajectory_shape_after_apply(cartesian_grid) -> None:
+    """The broadcasted shape should reflect changes of kz, ky, kx by apply."""
+    kz_full, ky_full, kx_full = cartesian_grid(30, 20, 10, jitter=0.0)
+    trajectory = KTrajectory(kz_full, ky_full, kx_full)
+    cropped = trajectory.apply(lambda x: x[..., :4] if isinstance(x, torch.Tensor) else x)
+    assert cropped.broadcasted_shape == (1, 1, 30, 20, 4)
+    assert cropped.as_tensor().shape == (3, 1, 1, 30, 20, 4)
+
+
 @pytest.mark.parametrize('dtype', [torch.float32, torch.float64, torch.int32, torch.int64])
 def test_trajectory_floating_dtype(dtype: torch.dtype) -> None:
     """Test if the trajectory will always be converted to float"""
@@ -14,7 +14,6 @@ from tests import RandomGenerator, autodiff_test
         ((None, 1.0),),  # case (-infty, 0.)
         ((1.0, None),),  # case (1, \infty)
         ((-5.0, 5.0),),  # case (-5, 5)
-        ((-torch.inf, torch.inf),),  # case (-5, 5)
     ],
 )
 def test_constraints_operator_bounds(bounds, beta):
@@ -41,6 +40,26 @@ def test_constraints_operator_bounds(bounds, beta):
         torch.testing.assert_close(cx.max(), torch.tensor(b))
 
 
+@pytest.mark.parametrize(
+    'bounds',
+    [
+        ((-torch.inf, torch.inf),),  # case (-infty, infty)
+        ((None, torch.inf),),  # case (-infty, infty)
+        ((-torch.inf, None),),  # case (-infty, infty)
+        ((None, None),),  # case (-infty, infty)
+    ],
+)
+def test_constraints_operator_infinite_bounds(bounds):
+    """Tests that infinite bounds are treated as no constraint."""
+    random_generator = RandomGenerator(seed=0)
+    x = random_generator.float32_tensor(size=(36,), low=-100.0, high=100.0)
+    constraints_op = ConstraintsOp(bounds)
+    (cx,) = constraints_op(x)
+    torch.testing.assert_close(cx, x)
+    (xx,) = constraints_op.inverse(cx)
+    torch.testing.assert_close(xx, x)
+
+
 @pytest.mark.parametrize('beta', [1, 0.5, 2])
 @pytest.mark.parametrize(
     'bounds',
@@ -130,6 +149,70 @@ def test_constraints_operator_multiple_inputs(bounds):
     torch.testing.assert_close(xx3, x3)
 
 
+@pytest.mark.parametrize(
+    'bounds',
+    [
+        ((1.0, None), (1.0, None), (1.0, None)),  # same lower bound
+        ((None, 1.0), (None, 1.0), (None, -1.0)),  # partly same upper bound
+        ((-1.0, 1.0), (-1.0, 1.0), (None, None)),  # same two-sided bounds
+    ],
+)
+def test_constraints_operator_shared_bounds(bounds):
+    """Inputs with the same bounds are transformed as if they had been transformed separately."""
+    random_generator = RandomGenerator(seed=0)
+    x = [
+        random_generator.float32_tensor(size=(36, 72), low=-5, high=5),
+        random_generator.float32_tensor(size=(10,), low=-5, high=5),
+        random_generator.float32_tensor(size=(3, 4, 5), low=-5, high=5),
+    ]
+    constraints_op = ConstraintsOp(bounds)
+    cx = constraints_op(*x)
+    for item, citem, bound in zip(x, cx, bounds, strict=True):
+        (expected,) = ConstraintsOp((bound,))(item)
+        assert citem.shape == item.shape
+        torch.testing.assert_close(citem, expected)
+
+
+def test_constraints_operator_shared_bounds_requires_grad():
+    """Inputs with the same bounds keep independent autograd properties."""
+    random_generator = RandomGenerator(seed=0)
+    x1 = random_generator.float32_tensor(size=(36,), low=-5, high=5).requires_grad_()
+    x2 = random_generator.float32_tensor(size=(10,), low=-5, high=5)
+    constraints_op = ConstraintsOp(bounds=((-1.0, 1.0), (-1.0, 1.0)))
+    cx1, cx2 = constraints_op(x1, x2)
+    assert cx1.requires_grad
+    assert not cx2.requires_grad
+    assert cx2.grad_fn is None
+    # outputs can be modified in-place
+    cx1.add_(1.0)
+    cx1.sum().backward()
+    assert x1.grad is not None
+
+
+def test_constraints_operator_shared_bounds_inplace():
+    """Outputs of inputs with the same bounds can be modified in-place without affecting each other."""
+    random_generator = RandomGenerator(seed=0)
+    x1 = random_generator.float32_tensor(size=(36,), low=-5, high=5)
+    x2 = random_generator.float32_tensor(size=(10,), low=-5, high=5)
+    constraints_op = ConstraintsOp(bounds=((-1.0, 1.0), (-1.0, 1.0)))
+    cx1, cx2 = constraints_op(x1, x2)
+    (expected2,) = ConstraintsOp(bounds=((-1.0, 1.0),))(x2)
+    cx1.add_(1.0)
+    torch.testing.assert_close(cx2, expected2)
+
+
+def test_constraints_operator_vmap():
+    """Test the operator can be vmapped."""
+    random_generator = RandomGenerator(seed=0)
+    x1 = random_generator.float32_tensor(size=(4, 36), low=-5, high=5)
+    x2 = random_generator.float32_tensor(size=(4, 10), low=-5, high=5)
+    constraints_op = ConstraintsOp(bounds=((-1.0, 1.0), (-1.0, 1.0)))
+    cx1, cx2 = torch.vmap(constraints_op)(x1, x2)
+    expected1, expected2 = constraints_op(x1, x2)
+    torch.testing.assert_close(cx1, expected1)
+    torch.testing.assert_close(cx2, expected2)
+
+
 @pytest.mark.parametrize(
     'bounds',
     [
@@ -139,6 +222,8 @@ def test_constraints_operator_multiple_inputs(bounds):
         ((torch.nan, 1),),  # invalid due to first bound being nan
         ((-1, torch.nan),),  # invalid due to second bound being nan
         ((torch.inf, -torch.inf),),  # invalid due to a>b
+        ((torch.inf, None),),  # invalid due to lower bound inf
+        ((None, -torch.inf),),  # invalid due to upper bound -inf
     ],
 )
 def test_constraints_operator_illegal_bounds(bounds):